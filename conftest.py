@@ -0,0 +1,5 @@
+import sys
+import pathlib
+
+# Make the pipeline module importable from the tests, once per test session
+sys.path.insert(0, str(pathlib.Path(__file__).parent))